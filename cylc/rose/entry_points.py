@@ -19,25 +19,21 @@ import os
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from cylc.rose.utilities import (
-    ROSE_SUITE_OPT_CONF_KEYS,
-    copy_config_file,
-    dump_rose_log,
-    export_environment,
-    load_rose_config,
-    process_config,
-    record_cylc_install_options,
-    retrieve_installed_cli_opts,
-    rose_config_exists,
-    sanitize_opts,
-)
-
 if TYPE_CHECKING:
     from cylc.flow.option_parsers import Values
 
 
 def pre_configure(srcdir: Path, opts: 'Values') -> dict:
     """Run before the Cylc configuration is read."""
+    from cylc.rose.utilities import (
+        export_environment,
+        load_rose_config,
+        process_config,
+        retrieve_installed_cli_opts,
+        rose_config_exists,
+        sanitize_opts,
+    )
+
     if not rose_config_exists(srcdir):
         # nothing to do here
         return {}
@@ -66,6 +62,13 @@ def pre_configure(srcdir: Path, opts: 'Values') -> dict:
 def post_install(srcdir: Path, rundir: str, opts: 'Values') -> bool:
     """Run after Cylc file installation has completed."""
     from cylc.rose.fileinstall import rose_fileinstall
+    from cylc.rose.utilities import (
+        ROSE_SUITE_OPT_CONF_KEYS,
+        copy_config_file,
+        dump_rose_log,
+        record_cylc_install_options,
+        rose_config_exists,
+    )
 
     if not rose_config_exists(srcdir):
         # nothing to do here
@@ -16,8 +16,9 @@
 
 """Utilities related to performing Rose file installation."""
 
+from contextlib import contextmanager
 import os
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Iterator, Union
 
 from cylc.rose.utilities import rose_config_exists, rose_config_tree_loader
 
@@ -27,6 +28,33 @@ if TYPE_CHECKING:
     from metomi.rose.config import ConfigNode
 
 
+# Prefix of file installation sections i.e. "file:<target>".
+FILE_SECTION_PREFIX = 'file:'
+
+
+@contextmanager
+def _chdir(path: 'Union[Path, str]') -> 'Iterator[None]':
+    """Change the working directory, restoring the original on exit.
+
+    (Similar to contextlib.chdir which requires Python 3.11)
+
+    Examples:
+        >>> cwd = os.getcwd()
+        >>> with _chdir('/'):
+        ...     os.getcwd()
+        '/'
+        >>> os.getcwd() == cwd
+        True
+
+    """
+    cwd = os.getcwd()
+    try:
+        os.chdir(path)
+        yield
+    finally:
+        os.chdir(cwd)
+
+
 def rose_fileinstall(
     rundir: 'Path',
     opts: 'Values',
@@ -38,31 +66,30 @@ def rose_fileinstall(
     # Load the config tree
     config_tree = rose_config_tree_loader(rundir, opts)
 
-    if any(i.startswith('file') for i in config_tree.node.value):
-        try:
-            # NOTE: Cylc will chdir back for us afterwards
-            os.chdir(rundir)
-        except FileNotFoundError as exc:
-            raise exc
-        else:
-            # Carry out imports.
-            from metomi.rose.config_processor import ConfigProcessorsManager
-            from metomi.rose.fs_util import FileSystemUtil
-            from metomi.rose.popen import RosePopener
-            from metomi.rose.reporter import Reporter
-
-            # Update config tree with install location
-            # NOTE-TO-SELF: value=os.environ["CYLC_WORKFLOW_RUN_DIR"]
-            config_tree.node = config_tree.node.set(
-                keys=["file-install-root"], value=str(rundir)
-            )
-
-            # Artificially set rose to verbose.
-            event_handler = Reporter(3)
-            fs_util = FileSystemUtil(event_handler)
-            popen = RosePopener(event_handler)
-
-            # Process fileinstall.
+    if any(
+        key.startswith(FILE_SECTION_PREFIX) for key in config_tree.node.value
+    ):
+        # Carry out imports.
+        from metomi.rose.config_processor import ConfigProcessorsManager
+        from metomi.rose.fs_util import FileSystemUtil
+        from metomi.rose.popen import RosePopener
+        from metomi.rose.reporter import Reporter
+
+        # Update config tree with install location
+        # NOTE-TO-SELF: value=os.environ["CYLC_WORKFLOW_RUN_DIR"]
+        config_tree.node = config_tree.node.set(
+            keys=["file-install-root"], value=str(rundir)
+        )
+
+        # Artificially set rose to verbose.
+        event_handler = Reporter(3)
+        fs_util = FileSystemUtil(event_handler)
+        popen = RosePopener(event_handler)
+
+        # Process fileinstall.
+        # NOTE: Rose resolves relative paths against the working directory
+        # and provides no way to pass it in
+        with _chdir(rundir):
             config_pm = ConfigProcessorsManager(event_handler, popen, fs_util)
             config_pm(config_tree, "file")
 
@@ -17,7 +17,8 @@
 
 from ast import literal_eval as python_literal_eval
 from contextlib import contextmanager
-from copy import deepcopy
+from functools import lru_cache
+from itertools import islice
 import re
 
 from cylc.flow import LOG
@@ -49,10 +50,40 @@ def _strip_leading_zeros(string):
         '0'
         >>> _strip_leading_zeros('000')
         '0'
+        >>> _strip_leading_zeros('0_1')
+        '1'
 
     """
-    ret = string.lstrip('0')
-    return ret or '0'
+    return str(int(string))
+
+
+@lru_cache(maxsize=None)
+def _patch_integer_re(integer_re):
+    r"""Helper for patch_jinja2_leading_zeros.
+
+    Returns the Jinja2 integer regex extended to match zero-padded integers.
+    The result is cached so the regex is only built once.
+
+    Examples:
+        >>> integer_re = re.compile(r'[1-9](_?\d)*')
+        >>> bool(_patch_integer_re(integer_re).fullmatch('007'))
+        True
+        >>> _patch_integer_re(integer_re) is _patch_integer_re(integer_re)
+        True
+
+    """
+    return re.compile(
+        rf'''
+            # Jinja2 no longer recognises zero-padded integers as integers
+            # so we must patch its regex to allow them to be detected.
+            (
+                [0-9](_?\d)* # decimal (which supports zero-padded integers)
+                |
+                {integer_re.pattern}
+            )
+        ''',
+        re.IGNORECASE | re.VERBOSE,
+    )
 
 
 def _lexer_wrap(fcn):
@@ -63,16 +94,24 @@ def _lexer_wrap(fcn):
     instances = set()
 
     def _stream(stream):
-        """Patch the token stream to strip the leading zero where necessary."""
+        """Patch the token stream to strip the leading zero where necessary.
+
+        The stream is consumed up front (rather than via a generator) as the
+        templates we parse are small.
+        """
         nonlocal instances  # record of uses of deprecated syntax
+        token_integer = jinja2.lexer.TOKEN_INTEGER
+        tokens = []
         for lineno, token, value_str in stream:
             if (
-                token == jinja2.lexer.TOKEN_INTEGER
+                token == token_integer
                 and len(value_str) > 1
                 and value_str[0] == '0'
             ):
                 instances.add(value_str)
-            yield (lineno, token, _strip_leading_zeros(value_str))
+                value_str = _strip_leading_zeros(value_str)
+            tokens.append((lineno, token, value_str))
+        return tokens
 
     def _inner(
         self,
@@ -138,19 +177,9 @@ def patch_jinja2_leading_zeros():
     jinja2.lexer._lexer_cache.clear()
 
     # apply the code patch (new lexer instances will pick up these changes)
-    _integer_re = deepcopy(jinja2.lexer.integer_re)
-    jinja2.lexer.integer_re = re.compile(
-        rf'''
-            # Jinja2 no longer recognises zero-padded integers as integers
-            # so we must patch its regex to allow them to be detected.
-            (
-                [0-9](_?\d)* # decimal (which supports zero-padded integers)
-                |
-                {jinja2.lexer.integer_re.pattern}
-            )
-        ''',
-        re.IGNORECASE | re.VERBOSE,
-    )
+    # (compiled patterns are immutable so no need to copy)
+    _integer_re = jinja2.lexer.integer_re
+    jinja2.lexer.integer_re = _patch_integer_re(_integer_re)
     jinja2.lexer.Lexer.wrap = _lexer_wrap(jinja2.lexer.Lexer.wrap)
 
     # execute the body of the "with" statement
@@ -170,9 +199,9 @@ def patch_jinja2_leading_zeros():
                 + (
                     '\n * '.join(
                         f'{before} => {_strip_leading_zeros(before)}'
-                        for before in list(
-                            jinja2.lexer.Lexer.wrap._instances
-                        )[:num_examples]
+                        for before in islice(
+                            jinja2.lexer.Lexer.wrap._instances, num_examples
+                        )
                     )
                 )
 
@@ -206,6 +235,21 @@ class Parser(NativeEnvironment):
         '^[\'"].*[\'"]$'
     )
 
+    # simple integers (without leading zeros) which don't need Jinja2
+    _INTEGER_REGEX = re.compile(
+        r'^[+-]?(0|[1-9][0-9]*)$'
+    )
+
+    # Jinja2 constants which don't need Jinja2
+    _CONSTANTS = {
+        'True': True,
+        'true': True,
+        'False': False,
+        'false': False,
+        'None': None,
+        'none': None,
+    }
+
     def literal_eval(self, value):
         r"""A jinja2 equivalent to Python's ast.literal_eval.
 
@@ -278,8 +322,13 @@ class Parser(NativeEnvironment):
         # pass string values through ast.literal_eval
         # (jinja2 will peel back the quotes to get at what's inside)
         value = value.strip()
-        if self._STRING_REGEX.match(value):
+        if value[:1] in ('"', "'") and self._STRING_REGEX.match(value):
             return python_literal_eval(value)
+        # handle simple values without going through Jinja2
+        if value in self._CONSTANTS:
+            return self._CONSTANTS[value]
+        if self._INTEGER_REGEX.match(value):
+            return int(value)
         # dump this value into a Jinja2 template
         templ = '{{ %s }}' % value
         # check that this expression consists only of literals
@@ -292,6 +341,8 @@ class Parser(NativeEnvironment):
                     f'Invalid literal: {value}'
                     f'\n{type(node)}'
                 )
-            stack.extend(list(node.iter_child_nodes()))
+            stack.extend(node.iter_child_nodes())
         # evaluate it
-        return self.from_string('{{ %s }}' % value).render()
+        # (compile the template we have already parsed, rather than parsing
+        # the expression again)
+        return self.from_string(ast).render()
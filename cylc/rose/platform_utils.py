@@ -18,12 +18,14 @@
 
 """Interfaces for Cylc Platforms for use by rose apps."""
 
+from contextlib import suppress
 from optparse import Values
 from pathlib import Path
+import shlex
 import sqlite3
 import subprocess
 from time import sleep
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, Union
 
 from cylc.flow.config import WorkflowConfig
 from cylc.flow.id_cli import parse_id
@@ -40,6 +42,9 @@ from cylc.flow.platforms import (
 )
 from cylc.flow.rundb import CylcWorkflowDAO
 
+# Characters which require a shell to interpret a subshell command.
+SHELL_CHARS = frozenset('|&;<>$`()*?{}[]~=#!\\\n')
+
 
 def get_platform_from_task_def(flow: str, task: str) -> Dict[str, Any]:
     """Return the platform dictionary for a particular task.
@@ -54,6 +59,25 @@ def get_platform_from_task_def(flow: str, task: str) -> Dict[str, Any]:
     Returns:
         Platform Dictionary.
     """
+    return get_platforms_from_task_defs(flow, [task])[task]
+
+
+def get_platforms_from_task_defs(
+    flow: str, tasks: Iterable[str]
+) -> Dict[str, Dict[str, Any]]:
+    """Return the platform dictionaries for several tasks.
+
+    Like get_platform_from_task_def, but the workflow config is only loaded
+    once. Platform/host subshells are evaluated for each task (they may not
+    be deterministic, e.g. host selection).
+
+    Args:
+        flow: The name of the Cylc flow to be queried.
+        tasks: The names of the tasks to be queried.
+
+    Returns:
+        Platform Dictionaries {task: platform}.
+    """
     workflow_id, _, _ = parse_id(flow, constraint='workflows', src=True)
     flow_file = get_workflow_run_config_log_dir(
         workflow_id,
@@ -65,22 +89,24 @@ def get_platform_from_task_def(flow: str, task: str) -> Dict[str, Any]:
         flow_file, Values(),
         force_compat_mode=get_compat_mode(get_workflow_run_dir(workflow_id))
     )
-    # Get entire task spec to allow Cylc 7 platform from host guessing.
-    task_spec = config.pcfg.get(['runtime', task])
-    # check for subshell and evaluate
-    if (
-        task_spec.get('platform')
-        and is_platform_definition_subshell(task_spec['platform'])
-    ):
-        task_spec['platform'] = eval_subshell(task_spec['platform'])
-    elif (
-        task_spec.get('remote', {}).get('host')
-        and HOST_REC_COMMAND.match(task_spec['remote']['host'])
-    ):
-        task_spec['remote']['host'] = eval_subshell(
-            task_spec['remote']['host'])
-    platform = get_platform(task_spec)
-    return platform
+
+    platforms: Dict[str, Dict[str, Any]] = {}
+    for task in tasks:
+        # Get entire task spec to allow Cylc 7 platform from host guessing.
+        task_spec = config.pcfg.get(['runtime', task])
+        # check for subshell and evaluate
+        platform_n = task_spec.get('platform')
+        remote_host = task_spec.get('remote', {}).get('host')
+        if platform_n and is_platform_definition_subshell(platform_n):
+            task_spec['platform'] = eval_subshell(platform_n)
+        elif remote_host:
+            host_match = HOST_REC_COMMAND.match(remote_host)
+            if host_match:
+                task_spec['remote']['host'] = eval_subshell(
+                    remote_host, host_match
+                )
+        platforms[task] = get_platform(task_spec)
+    return platforms
 
 
 def get_compat_mode(run_dir: Union[str, Path]) -> bool:
@@ -94,11 +120,36 @@ def get_compat_mode(run_dir: Union[str, Path]) -> bool:
     return (Path(run_dir) / WorkflowFiles.SUITE_RC).exists()
 
 
-def eval_subshell(platform):
-    """Evaluates platforms/hosts defined as subshell"""
-    match = HOST_REC_COMMAND.match(platform)
+def eval_subshell(platform, match=None):
+    """Evaluates platforms/hosts defined as subshell
+
+    Simple commands are run directly, anything else is run with bash.
+
+    Args:
+        platform: The platform/host subshell e.g. "$(rose host-select)".
+        match: The HOST_REC_COMMAND match of the platform (if the caller has
+            already matched it).
+
+    Examples:
+        >>> eval_subshell('$(echo "my-host")')
+        'my-host'
+        >>> eval_subshell('$(echo my-host | tr a-z A-Z)')
+        'MY-HOST'
+
+    """
+    if match is None:
+        match = HOST_REC_COMMAND.match(platform)
+    cmd = match[2]
+    if SHELL_CHARS.isdisjoint(cmd):
+        # no need to start a shell
+        # (fall back to bash if the command can't be run directly)
+        with suppress(OSError, ValueError):
+            args = shlex.split(cmd)
+            if args:
+                output = subprocess.run(args, capture_output=True, text=True)
+                return output.stdout.strip()
     output = subprocess.run(
-        ['bash', '-c', match[2]], capture_output=True, text=True
+        ['bash', '-c', cmd], capture_output=True, text=True
     )
     return output.stdout.strip()
 
@@ -127,36 +178,44 @@ def get_platforms_from_task_jobs(
         is_public=True,
     )
     task_platform_map: Dict = {}
+    # platforms looked up so far {platform_name: platform}
+    # (there are typically far fewer platforms than jobs)
+    platforms: Dict[str, Dict[str, Any]] = {}
+    # NOTE: SQLite takes the "bare" platform_name column from the row with
+    # the MAX(submit_num) i.e. the most recent submission of each task
     stmt = '''
         SELECT
-            name, platform_name, submit_num
+            name, platform_name, MAX(submit_num)
         FROM
             task_jobs
         WHERE
             cycle=?
+        GROUP BY
+            name
     '''
     db_exc: Exception
     try:
         for _try in range(10):  # connect/execute retries
             try:
-                for row in dao.connect().execute(stmt, [cyclepoint]):
-                    task, platform_n, submit_num = row
-                    platform = get_platform(platform_n)
-                    if (
-                        (
-                            task in task_platform_map
-                            and task_platform_map[task][0] < submit_num
+                for task, platform_n, _submit_num in dao.connect().execute(
+                    stmt, (cyclepoint,)
+                ):
+                    try:
+                        platform = platforms[platform_n]
+                    except KeyError:
+                        platform = platforms[platform_n] = get_platform(
+                            platform_n
                         )
-                        or task not in task_platform_map
-                    ):
-                        task_platform_map[task] = [submit_num, platform]
+                    task_platform_map[task] = platform
                 break
             except sqlite3.OperationalError as exc:
                 db_exc = exc
                 # sleep between tries to give time for other reads to clear or
                 # for the scheduler to copy the private DB over the public one
                 # (done in the event of DB locking)
-                sleep(0.1)
+                # back off exponentially (0.01s, 0.02s, ... up to 0.2s) so
+                # short locks clear quickly (total wait over all tries ~1.3s)
+                sleep(min(0.01 * 2 ** _try, 0.2))
         else:
             # we've run out of retries, raise the error from the last retry
             raise db_exc
@@ -165,9 +224,4 @@ def get_platforms_from_task_jobs(
         # opened
         dao.close()
 
-    # get rid of the submit number, we don't want it
-    task_platform_map = {
-        key: value[1] for key, value in task_platform_map.items()
-    }
-
     return task_platform_map
@@ -60,6 +60,7 @@ Jinja2 Variables
         is intended to specify the revision of `fcm-make` config files.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from optparse import OptionGroup
 import os
@@ -73,23 +74,26 @@ from cylc.flow.scripts.install import get_option_parser
 from cylc.flow.scripts.install import install as cylc_install
 import metomi.rose.config
 from metomi.rose.fs_util import FileSystemUtil
-from metomi.rose.host_select import HostSelector
 from metomi.rose.popen import RosePopener
 from metomi.rose.reporter import Event, Reporter
 from metomi.rose.resource import ResourceLocator
 
-from cylc.rose.entry_points import (
-    export_environment,
-    load_rose_config,
-)
 from cylc.rose.utilities import (
+    export_environment,
     id_templating_section,
+    load_rose_config,
     process_config,
 )
 
 EXC_EXIT = cparse('<red><bold>{name}: </bold>{exc}</red>')
 DEFAULT_TEST_DIR = 'rose-stem'
 ROSE_STEM_VERSION = 1
+# Maximum number of source trees to look up with fcm at once.
+MAX_FCM_WORKERS = 8
+# URL schemes which point to repository locations (rather than working copies).
+REPOSITORY_SCHEMES = frozenset({'svn', 'fcm', 'http', 'https', 'svn+ssh'})
+# Pattern used to extract project names from 'fcm kp' output.
+KP_LOCATION_PRIMARY = re.compile(r'location{primary}\[(.*)\]')
 
 
 class ConfigVariableSetEvent(Event):
@@ -239,8 +243,9 @@ class StemRunner:
         else:
             self.fs_util = fs_util
 
-        self.host_selector = HostSelector(event_handler=self.reporter,
-                                          popen=self.popen)
+        self.local_host = None
+        # results of fcm commands keyed by their arguments
+        self._fcm_results = {}
         self.template_section = '[template variables]'
 
     def _add_define_option(self, var, val):
@@ -250,12 +255,22 @@ class StemRunner:
             var: Name of variable to set
             val: Value of variable to set
         """
+        define = f'{self.template_section}{var}={val}'
         if self.opts.defines:
-            self.opts.defines.append(self.template_section + var + '=' + val)
+            self.opts.defines.append(define)
         else:
-            self.opts.defines = [self.template_section + var + '=' + val]
+            self.opts.defines = [define]
         self.reporter(ConfigVariableSetEvent(var, val))
-        return
+
+    def _run_fcm(self, *args):
+        """Run an fcm command, re-using the result of any previous call.
+
+        The same source tree can be looked up more than once in the course
+        of a "rose stem" command, this avoids running fcm for it each time.
+        """
+        if args not in self._fcm_results:
+            self._fcm_results[args] = self.popen.run('fcm', *args)
+        return self._fcm_results[args]
 
     def _get_fcm_loc_layout_info(self, src_tree):
         """Given a source tree return the following from 'fcm loc-layout':
@@ -266,16 +281,13 @@ class StemRunner:
            * project
         """
 
-        ret_code, output, stderr = self.popen.run(
-            'fcm', 'loc-layout', src_tree)
+        ret_code, output, stderr = self._run_fcm('loc-layout', src_tree)
         if ret_code != 0:
             raise ProjectNotFoundException(src_tree, stderr)
 
         ret = {}
         for line in output.splitlines():
-            if ":" not in line:
-                continue
-            key, value = line.split(":", 1)
+            key, _, value = line.partition(":")
 
             if key and value:
                 ret[key] = value.strip()
@@ -288,11 +300,11 @@ class StemRunner:
         if source_dict['project']:
             repo += '/' + source_dict['project']
 
-        kpoutput = self.popen.run('fcm', 'kp', source_dict['url'])[1]
+        kpoutput = self._run_fcm('kp', source_dict['url'])[1]
         project = None
         for line in kpoutput.splitlines():
             if line.rstrip().endswith(repo):
-                kpresult = re.search(r'^location{primary}\[(.*)\]', line)
+                kpresult = KP_LOCATION_PRIMARY.match(line)
                 if kpresult:
                     project = kpresult.group(1)
                     break
@@ -306,7 +318,8 @@ class StemRunner:
         proj_root = source_dict['root'] + '/' + source_dict['project']
 
         # Swap project to mirror
-        project = re.sub(r'\.x$', r'.xm', project)
+        if project.endswith('.x'):
+            project += 'm'
         mirror_repo = "fcm:" + project
 
         # Generate mirror location
@@ -314,11 +327,11 @@ class StemRunner:
 
         # Remove any sub-tree
         mirror = re.sub(source_dict['sub_tree'], r'', mirror)
-        mirror = re.sub(r'/@', r'@', mirror)
+        mirror = mirror.replace('/@', '@')
 
         # Add forwards slash after .xm if missing
         if '.xm/' not in mirror:
-            mirror = re.sub(r'\.xm', r'.xm/', mirror)
+            mirror = mirror.replace('.xm', '.xm/')
         return mirror
 
     def _ascertain_project(self, item):
@@ -334,7 +347,7 @@ class StemRunner:
         with suppress(ValueError):
             project, item = item.split("=", 1)
 
-        if re.search(r'^\.', item):
+        if item.startswith('.'):
             item = os.path.abspath(os.path.join(os.getcwd(), item))
 
         if project:
@@ -350,24 +363,24 @@ class StemRunner:
 
         if 'peg_rev' in source_dict and '@' in item:
             revision = '@' + source_dict['peg_rev']
-            base = re.sub(r'@.*', r'', item)
+            base = item.split('@', 1)[0]
         else:
             revision = ''
             base = item
 
         # Remove subtree from base and item
         if 'sub_tree' in source_dict:
-            item = re.sub(
-                r'(.*)%s/?$' % (source_dict['sub_tree']), r'\1', item, count=1)
-            base = re.sub(
-                r'(.*)%s/?$' % (source_dict['sub_tree']), r'\1', base, count=1)
+            item = _strip_sub_tree(item, source_dict['sub_tree'])
+            base = _strip_sub_tree(base, source_dict['sub_tree'])
 
         # Remove trailing forwards-slash
-        item = re.sub(r'/$', r'', item)
-        base = re.sub(r'/$', r'', base)
+        if item.endswith('/'):
+            item = item[:-1]
+        if base.endswith('/'):
+            base = base[:-1]
 
         # Remove anything after a point
-        project = re.sub(r'\..*', r'', project)
+        project = project.split('.', 1)[0]
         return project, item, base, revision, mirror
 
     def _generate_name(self):
@@ -397,13 +410,11 @@ class StemRunner:
         suitedir = os.path.join(basedir, DEFAULT_TEST_DIR)
         suitefile = os.path.join(suitedir, "rose-suite.conf")
 
-        if not os.path.isfile(suitefile):
-            raise RoseSuiteConfNotFoundException(suitedir)
+        # (raises RoseSuiteConfNotFoundException if suitefile is missing)
+        self._check_suite_version(suitefile)
 
         self.opts.suite = suitedir
 
-        self._check_suite_version(suitefile)
-
         return suitedir
 
     def _read_auto_opts(self):
@@ -427,9 +438,16 @@ class StemRunner:
     def _prepend_localhost(self, url):
         """Prepend the local hostname to urls which do not point to repository
         locations."""
-        if ':' not in url or url.split(':', 1)[0] not in ['svn', 'fcm', 'http',
-                                                          'https', 'svn+ssh']:
-            url = self.host_selector.get_local_host() + ':' + url
+        scheme, sep, _ = url.partition(':')
+        if not sep or scheme not in REPOSITORY_SCHEMES:
+            # (the local host is only looked up once)
+            if self.local_host is None:
+                from metomi.rose.host_select import HostSelector
+                self.local_host = HostSelector(
+                    event_handler=self.reporter,
+                    popen=self.popen,
+                ).get_local_host()
+            url = self.local_host + ':' + url
         return url
 
     def _parse_auto_opts(self):
@@ -440,12 +458,11 @@ class StemRunner:
         """
         auto_opts = self._read_auto_opts()
         if auto_opts:
-            automatic_options = auto_opts.split()
-            for option in automatic_options:
-                elements = option.split("=")
-                if len(elements) == 2:
-                    self._add_define_option(
-                        elements[0], '"' + elements[1] + '"')
+            for option in auto_opts.split():
+                key, sep, value = option.partition('=')
+                # (skip malformed options e.g. "foo" or "foo=bar=baz")
+                if sep and '=' not in value:
+                    self._add_define_option(key, f'"{value}"')
 
     def process(self):
         """Process STEM options into 'rose suite-run' options."""
@@ -456,8 +473,16 @@ class StemRunner:
             self.opts.stem_sources = ['.']
         self.opts.project = []
 
-        for i, url in enumerate(self.opts.stem_sources):
-            project, url, base, rev, mirror = self._ascertain_project(url)
+        # Look up the source trees in parallel
+        # (each requires fcm subprocesses which spend most of their time
+        # waiting on the repository)
+        sources = self.opts.stem_sources
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_FCM_WORKERS, len(sources))
+        ) as executor:
+            results = list(executor.map(self._ascertain_project, sources))
+
+        for i, (project, url, base, rev, mirror) in enumerate(results):
             self.opts.stem_sources[i] = url
             self.opts.project.append(project)
 
@@ -475,38 +500,38 @@ class StemRunner:
             url_host = self._prepend_localhost(url)
             base_host = self._prepend_localhost(base)
 
-            if project in repos:
-                repos[project].append(url)
-                repos_with_hosts[project].append(url_host)
-            else:
-                repos[project] = [url]
-                repos_with_hosts[project] = [url_host]
-                self._add_define_option('SOURCE_' + project.upper() + '_REV',
-                                        '"' + rev + '"')
-                self._add_define_option('SOURCE_' + project.upper() + '_BASE',
-                                        '"' + base + '"')
-                self._add_define_option('HOST_SOURCE_' + project.upper() +
-                                        '_BASE', '"' + base_host + '"')
-                self._add_define_option('SOURCE_' + project.upper() +
-                                        '_MIRROR', '"' + mirror + '"')
+            # (the first source for each project sets its base, rev & mirror)
+            branches = repos.setdefault(project, [])
+            if not branches:
+                name = project.upper()
+                self._add_define_option(f'SOURCE_{name}_REV', f'"{rev}"')
+                self._add_define_option(f'SOURCE_{name}_BASE', f'"{base}"')
+                self._add_define_option(
+                    f'HOST_SOURCE_{name}_BASE', f'"{base_host}"')
+                self._add_define_option(
+                    f'SOURCE_{name}_MIRROR', f'"{mirror}"')
+            branches.append(url)
+            repos_with_hosts.setdefault(project, []).append(url_host)
             self.reporter(SourceTreeAddedAsBranchEvent(url))
 
         for project, branches in repos.items():
-            var = 'SOURCE_' + project.upper()
             branchstring = RosePopener.list_to_shell_str(branches)
-            self._add_define_option(var, '"' + branchstring + '"')
+            self._add_define_option(
+                f'SOURCE_{project.upper()}', f'"{branchstring}"')
         for project, branches in repos_with_hosts.items():
-            var_host = 'HOST_SOURCE_' + project.upper()
             branchstring = RosePopener.list_to_shell_str(branches)
-            self._add_define_option(var_host, '"' + branchstring + '"')
+            self._add_define_option(
+                f'HOST_SOURCE_{project.upper()}', f'"{branchstring}"')
 
         # Generate the variable containing tasks to run
         if self.opts.stem_groups:
             if not self.opts.defines:
                 self.opts.defines = []
-            expanded_groups = []
-            for i in self.opts.stem_groups:
-                expanded_groups.extend(i.split(','))
+            expanded_groups = [
+                group
+                for groups in self.opts.stem_groups
+                for group in groups.split(',')
+            ]
             self.opts.defines.append(
                 f"{self.template_section}RUN_NAMES={str(expanded_groups)}")
 
@@ -529,6 +554,25 @@ class StemRunner:
         return self.opts
 
 
+def _strip_sub_tree(location, sub_tree):
+    """Remove a sub-tree (and any trailing slash) from a source location.
+
+    Examples:
+        >>> _strip_sub_tree('/path/to/wc/src/foo', 'src/foo')
+        '/path/to/wc/'
+        >>> _strip_sub_tree('/path/to/wc/src/foo/', 'src/foo')
+        '/path/to/wc/'
+        >>> _strip_sub_tree('/path/to/wc', 'src/foo')
+        '/path/to/wc'
+
+    """
+    if sub_tree:
+        for suffix in (sub_tree, sub_tree + '/'):
+            if location.endswith(suffix):
+                return location[:-len(suffix)]
+    return location
+
+
 def get_source_opt_from_args(opts, args):
     """Convert sourcedir given as arg or implied by no arg to
     opts.workflow_conf_dir.
@@ -619,7 +663,7 @@ async def rose_stem(parser, opts):
 
     except CylcError as exc:
         if opts.verbosity > 1:
-            raise exc
+            raise
         print(
             EXC_EXIT.format(
                 name=exc.__class__.__name__,
@@ -30,7 +30,6 @@ from cylc.flow.exceptions import CylcError
 from cylc.flow.flags import cylc7_back_compat
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.hostuserutil import get_host
-from metomi.isodatetime.datetimeoper import DateTimeOperator
 from metomi.rose import __version__ as ROSE_VERSION
 from cylc.flow import __version__ as CYLC_VERSION
 from cylc.rose import __version__ as CYLC_ROSE_VERSION
@@ -40,18 +39,16 @@ from metomi.rose.config import (
     ConfigNode,
     ConfigNodeDiff,
 )
-from metomi.rose.config_processor import ConfigProcessError
-from metomi.rose.config_tree import ConfigTree
-from metomi.rose.env import UnboundEnvironmentVariableError, env_var_process
-
-from cylc.rose.jinja2_parser import Parser, patch_jinja2_leading_zeros
 
 if TYPE_CHECKING:
     from cylc.flow.option_parsers import Values
+    from metomi.rose.config_tree import ConfigTree
 
 
 ROSE_SUITE_OPT_CONF_KEYS = 'ROSE_SUITE_OPT_CONF_KEYS'
 SECTIONS = {'jinja2:suite.rc', 'template variables'}
+# Sections which ROSE_ORIG_HOST is recorded in by cylc install.
+ROSE_ORIG_HOST_SECTIONS = SECTIONS | {'env'}
 SET_BY_CYLC = 'set by Cylc'
 ROSE_ORIG_HOST_INSTALLED_OVERRIDE_STRING = (
     ' ROSE_ORIG_HOST set by cylc install.'
@@ -63,6 +60,14 @@ STANDARD_VARS = [
     ('ROSE_VERSION', ROSE_VERSION),
     ('CYLC_VERSION', SET_BY_CYLC),
 ]
+# Shared Rose config loader/dumper (these hold no per-file state).
+_LOADER = ConfigLoader()
+_DUMPER = ConfigDumper()
+# Matches CLI defines, e.g. "[section]key=value" and "key=value".
+CLI_SECTION_DEFINE = re.compile(
+    r'^\[(?P<section>.*)\](?P<state>!{0,2})(?P<key>.*)\s*=\s*(?P<value>.*)'
+)
+CLI_DEFINE = re.compile(r'^(?P<state>!{0,2})(?P<key>.*)\s*=\s*(?P<value>.*)')
 
 
 class NotARoseSuiteException(Exception):
@@ -108,6 +113,12 @@ def process_config(
         'template_variables': {},
         'templating_detected': None,
     }
+    from metomi.rose.config_processor import ConfigProcessError
+    from metomi.rose.env import (
+        UnboundEnvironmentVariableError,
+        env_var_process,
+    )
+
     config_node = config_tree.node
 
     # Don't allow multiple templating sections.
@@ -128,6 +139,8 @@ def process_config(
         config_node.set([templating])
 
     # For each section process variables and add standard variables.
+    # (the active settings are extracted to simple dicts along the way)
+    settings: Dict[str, Dict[str, Any]] = {}
     for section in ['env', templating]:
         # This loop handles standard variables.
         # CYLC_VERSION - If it's in the config, remove it.
@@ -152,32 +165,29 @@ def process_config(
             ):
                 config_node[section].set([var_name], replace_with)
 
-        # Use env_var_process to process variables which may need expanding.
+        # Use env_var_process to process variables which may need expanding
+        # (only values containing "$" can reference other variables).
+        section_settings = settings[section] = {}
         for key, node in config_node.value[section].value.items():
-            try:
-                config_node.value[section].value[key].value = env_var_process(
-                    node.value, environ=environ
-                )
-                if section == 'env':
-                    environ[key] = node.value
-            except UnboundEnvironmentVariableError as exc:
-                raise ConfigProcessError(['env', key], node.value, exc)
-
-    # For each of the template language sections extract items to a simple
-    # dict to be returned.
-    plugin_result['env'] = {
-        item[0][1]: item[1].value
-        for item in config_node.value['env'].walk()
-        if item[1].state == ConfigNode.STATE_NORMAL
-    }
-    plugin_result['template_variables'] = {
-        item[0][1]: item[1].value
-        for item in config_node.value[templating].walk()
-        if item[1].state == ConfigNode.STATE_NORMAL
-    }
+            if '$' in node.value:
+                try:
+                    node.value = env_var_process(node.value, environ=environ)
+                except UnboundEnvironmentVariableError as exc:
+                    raise ConfigProcessError(['env', key], node.value, exc)
+            if section == 'env':
+                environ[key] = node.value
+            if node.state == ConfigNode.STATE_NORMAL:
+                section_settings[key] = node.value
+
+    # For each of the template language sections return the extracted items.
+    plugin_result['env'] = settings['env']
+    plugin_result['template_variables'] = settings[templating]
 
     # Add the entire plugin_result to ROSE_SUITE_VARIABLES to allow for
     # programatic access.
+    # (Jinja2 is only imported if needed)
+    from cylc.rose.jinja2_parser import Parser, patch_jinja2_leading_zeros
+
     with patch_jinja2_leading_zeros():
         # BACK COMPAT: patch_jinja2_leading_zeros
         # back support zero-padded integers for a limited time to help
@@ -213,7 +223,7 @@ def identify_templating_section(config_node):
     Raises MultipleTemplatingEnginesError if multiple
     templating sections exist.
     """
-    defined_sections = SECTIONS.intersection(set(config_node.value.keys()))
+    defined_sections = SECTIONS.intersection(config_node.value)
     if len(defined_sections) > 1:
         raise MultipleTemplatingEnginesError(
             "You should not define more than one templating section. "
@@ -240,7 +250,7 @@ def id_templating_section(
     return templating
 
 
-def rose_config_exists(dir_: Path) -> bool:
+def rose_config_exists(dir_: Union[Path, str, None]) -> bool:
     """Does dir_ a rose config?
 
     Args:
@@ -249,14 +259,22 @@ def rose_config_exists(dir_: Path) -> bool:
     Returns:
         True if a ``rose-suite.conf`` exists, or option config items have
         been set.
+
+    Examples:
+        >>> rose_config_exists(None)
+        False
+        >>> rose_config_exists('/no/such/dir')
+        False
     """
-    return (dir_ / 'rose-suite.conf').is_file()
+    if dir_ is None:
+        return False
+    return os.path.isfile(os.path.join(dir_, 'rose-suite.conf'))
 
 
 def rose_config_tree_loader(
     srcdir: Path,
     opts: 'Optional[Values]',
-) -> ConfigTree:
+) -> 'ConfigTree':
     """Get a rose config tree from srcdir.
 
     Args:
@@ -276,7 +294,7 @@ def rose_config_tree_loader(
         opt_conf_keys += shlex.split(opt_conf_keys_env)
 
     # ... or as command line options
-    if opts and 'opt_conf_keys' in dir(opts) and opts.opt_conf_keys:
+    if opts and getattr(opts, 'opt_conf_keys', None):
         if isinstance(opts.opt_conf_keys, str):
             opt_conf_keys += opts.opt_conf_keys.split()
         else:
@@ -284,7 +302,7 @@ def rose_config_tree_loader(
 
     # Optional definitions
     redefinitions = []
-    if opts and 'defines' in dir(opts) and opts.defines:
+    if opts and getattr(opts, 'defines', None):
         redefinitions = opts.defines
 
     # Load the config tree
@@ -323,6 +341,10 @@ def merge_rose_cylc_suite_install_conf(old, new):
 
     If the template language has changed, use the new templating language.
 
+    Note:
+        The merge is performed in place, ``old`` is modified and returned
+        (no copies are made).
+
     Args:
         old, new (ConfigNode):
             Old and new nodes.
@@ -431,21 +453,13 @@ def parse_cli_defines(
         >>> parse_cli_defines('[section]orange = "segment"')
         (['section', 'orange'], '"segment"', '')
     """
-    match = re.match(
-        (
-            r'^\[(?P<section>.*)\](?P<state>!{0,2})'
-            r'(?P<key>.*)\s*=\s*(?P<value>.*)'
-        ),
-        define,
-    )
+    match = CLI_SECTION_DEFINE.match(define)
     if match:
         groupdict = match.groupdict()
         keys = [groupdict['section'].strip(), groupdict['key'].strip()]
     else:
         # Doesn't have a section:
-        match = re.match(
-            r'^(?P<state>!{0,2})(?P<key>.*)\s*=\s*(?P<value>.*)', define
-        )
+        match = CLI_DEFINE.match(define)
         if match and not match['state']:
             groupdict = match.groupdict()
             keys = [groupdict['key'].strip()]
@@ -485,15 +499,11 @@ def get_cli_opts_node(srcdir: Path, opts: 'Values'):
         {'value': 'BAZ', 'state': '', 'comments': []}
     """
     # Unpack info we want from opts:
-    opt_conf_keys: list = []
-    defines: list = []
-    rose_template_vars: list = []
-    if opts and 'opt_conf_keys' in dir(opts):
-        opt_conf_keys = opts.opt_conf_keys or []
-    if opts and 'defines' in dir(opts):
-        defines = opts.defines or []
-    if opts and 'rose_template_vars' in dir(opts):
-        rose_template_vars = opts.rose_template_vars or []
+    opt_conf_keys: list = getattr(opts, 'opt_conf_keys', None) or []
+    defines: list = getattr(opts, 'defines', None) or []
+    rose_template_vars: list = (
+        getattr(opts, 'rose_template_vars', None) or []
+    )
 
     rose_orig_host = get_host()
     defines.append(f'[env]ROSE_ORIG_HOST={rose_orig_host}')
@@ -519,9 +529,7 @@ def get_cli_opts_node(srcdir: Path, opts: 'Values'):
         )
 
     for define in rose_template_vars:
-        _match = re.match(
-            r'(?P<state>!{0,2})(?P<key>.*)\s*=\s*(?P<value>.*)', define
-        )
+        _match = CLI_DEFINE.match(define)
         if not _match:
             raise ValueError(f'Invalid define: {define}')
         _match_groups = _match.groupdict()
@@ -551,6 +559,14 @@ def add_cylc_install_to_rose_conf_node_opts(rose_conf, cli_conf):
 
     Returns:
         A combined ConfigNode.
+
+    Examples:
+        >>> from metomi.rose.config import ConfigNode
+        >>> rose_conf = ConfigNode().set(['opts'], 'a (cylc-install)')
+        >>> cli_conf = ConfigNode().set(['opts'], 'b')
+        >>> add_cylc_install_to_rose_conf_node_opts(
+        ...     rose_conf, cli_conf)['opts'].value
+        'a b (cylc-install)'
     """
 
     if 'opts' in cli_conf:
@@ -567,7 +583,8 @@ def add_cylc_install_to_rose_conf_node_opts(rose_conf, cli_conf):
     if rose_conf['opts'].state not in ['!', '!!']:
         opts += rose_conf["opts"].value.split()
     opts += cli_opts.split() + ['(cylc-install)']
-    rose_conf['opts'].value = ' '.join(opts)
+    # (cylc-install) must come last, remove any copies from earlier installs
+    rose_conf['opts'].value = simplify_opts_strings(' '.join(opts))
     rose_conf['opts'].state = ''
     return rose_conf
 
@@ -675,14 +692,15 @@ def dump_rose_log(rundir: Path, node: ConfigNode):
     Returns:
         String filepath of the dump file relative to the install directory.
     """
-    dumper = ConfigDumper()
+    from metomi.isodatetime.datetimeoper import DateTimeOperator
+
     timestamp = DateTimeOperator().process_time_point_str(
         print_format='%Y%m%dT%H%M%S%z'
     )
     rel_path = f'log/config/{timestamp}-rose-suite.conf'
     fpath = rundir / rel_path
     fpath.parent.mkdir(exist_ok=True, parents=True)
-    dumper.dump(node, str(fpath))
+    _DUMPER.dump(node, str(fpath))
     return rel_path
 
 
@@ -837,6 +855,7 @@ def load_rose_config(
             or getattr(opts, "rose_template_vars", None)
         ):
             raise NotARoseSuiteException()
+        from metomi.rose.config_tree import ConfigTree
         return ConfigTree()
 
     # Check for definitely invalid defines
@@ -851,9 +870,12 @@ def load_rose_config(
 
 
 def export_environment(environment: Dict[str, str]) -> None:
-    # Export environment vars
-    for key, val in environment.items():
-        os.environ[key] = val
+    # Export environment vars (only setting those which have changed)
+    os.environ.update({
+        key: val
+        for key, val in environment.items()
+        if os.environ.get(key) != val
+    })
 
     # If env vars have been set we want to force reload
     # the global config so that the value of this vars
@@ -915,11 +937,11 @@ def record_cylc_install_options(
     identify_templating_section(cli_config)
 
     # Construct path objects representing our target files.
-    (Path(rundir) / 'opt').mkdir(exist_ok=True)
-    conf_filepath = Path(rundir) / 'opt/rose-suite-cylc-install.conf'
-    rose_conf_filepath = Path(rundir) / 'rose-suite.conf'
-    dumper = ConfigDumper()
-    loader = ConfigLoader()
+    _rundir: Path = Path(rundir)
+    opt_dir = _rundir / 'opt'
+    conf_filepath = opt_dir / 'rose-suite-cylc-install.conf'
+    rose_conf_filepath = _rundir / 'rose-suite.conf'
+    opt_dir.mkdir(exist_ok=True)
 
     # If file exists we need to merge with our new config, over-writing with
     # new items where there are duplicates.
@@ -927,45 +949,61 @@ def record_cylc_install_options(
         if opts.clear_rose_install_opts:
             conf_filepath.unlink()
         else:
-            oldconfig = loader.load(str(conf_filepath))
+            oldconfig = _LOADER.load(str(conf_filepath))
             # Check old config for clashing template variables sections.
             identify_templating_section(oldconfig)
             cli_config = merge_rose_cylc_suite_install_conf(
                 oldconfig, cli_config
             )
 
-    # Get Values for standard ROSE variable ROSE_ORIG_HOST.
-    rose_orig_host = get_host()
-    for section in list(SECTIONS) + ['env']:
-        if section in cli_config:
-            cli_config[section].set(['ROSE_ORIG_HOST'], rose_orig_host)
-            cli_config[section]['ROSE_ORIG_HOST'].comments = [
-                ROSE_ORIG_HOST_INSTALLED_OVERRIDE_STRING
-            ]
-
-    if modify:
-        cli_config.comments = [' This file records CLI Options.']
-        cli_config.comments += [
-            ' Installed with:',
-            f'     * Cylc Rose: {CYLC_ROSE_VERSION}',
-            f'     * Rose     : {ROSE_VERSION}',
-            f'     * Cylc     : {CYLC_VERSION}']
-        dumper.dump(cli_config, str(conf_filepath))
+    _add_install_info(cli_config, modify)
 
     # Merge the opts section of the rose-suite.conf with those set by CLI:
-    rose_conf_filepath.touch()
-    rose_suite_conf = loader.load(str(rose_conf_filepath))
+    if rose_conf_filepath.is_file():
+        rose_suite_conf = _LOADER.load(str(rose_conf_filepath))
+    else:
+        # (the file will be created when the config is dumped)
+        rose_suite_conf = ConfigNode()
     rose_suite_conf = add_cylc_install_to_rose_conf_node_opts(
         rose_suite_conf, cli_config
     )
     identify_templating_section(rose_suite_conf)
 
     if modify:
-        dumper(rose_suite_conf, rose_conf_filepath)
+        # write both files once both configs have been validated
+        _DUMPER.dump(cli_config, str(conf_filepath))
+        _DUMPER.dump(rose_suite_conf, str(rose_conf_filepath))
 
     return cli_config, rose_suite_conf
 
 
+def _add_install_info(cli_config: ConfigNode, modify: bool) -> None:
+    """Add ROSE_ORIG_HOST and install version info to the Cylc install config.
+
+    Args:
+        cli_config:
+            The Cylc install config, this is modified in place.
+        modify:
+            If True, add the version info comments (for writing to file).
+
+    """
+    # Get Values for standard ROSE variable ROSE_ORIG_HOST.
+    rose_orig_host = get_host()
+    for section in ROSE_ORIG_HOST_SECTIONS.intersection(cli_config.value):
+        cli_config[section].set(['ROSE_ORIG_HOST'], rose_orig_host)
+        cli_config[section]['ROSE_ORIG_HOST'].comments = [
+            ROSE_ORIG_HOST_INSTALLED_OVERRIDE_STRING
+        ]
+
+    if modify:
+        cli_config.comments = [' This file records CLI Options.']
+        cli_config.comments += [
+            ' Installed with:',
+            f'     * Cylc Rose: {CYLC_ROSE_VERSION}',
+            f'     * Rose     : {ROSE_VERSION}',
+            f'     * Cylc     : {CYLC_VERSION}']
+
+
 def copy_config_file(
     srcdir: Path,
     rundir: Path,
@@ -989,7 +1027,8 @@ def copy_config_file(
         return False
     elif rundir_rose_conf.is_file():
         rundir_rose_conf.unlink()
-    shutil.copy2(srcdir_rose_conf, rundir_rose_conf)
+    # (the file metadata isn't needed, so copyfile rather than copy2)
+    shutil.copyfile(srcdir_rose_conf, rundir_rose_conf)
 
     return True
 
@@ -30,14 +30,12 @@ from metomi.rose.config import ConfigLoader
 from metomi.rose.config_tree import ConfigTree
 import pytest
 
-from cylc.rose.entry_points import (
-    copy_config_file,
-    post_install,
-    record_cylc_install_options,
-)
+from cylc.rose.entry_points import post_install
 from cylc.rose.fileinstall import rose_fileinstall
 from cylc.rose.utilities import (
     ROSE_ORIG_HOST_INSTALLED_OVERRIDE_STRING,
+    copy_config_file,
+    record_cylc_install_options,
 )
 
 HOST = get_host()
@@ -19,7 +19,7 @@
 from pathlib import Path
 from textwrap import dedent
 
-from cylc.rose.entry_points import copy_config_file
+from cylc.rose.utilities import copy_config_file
 
 from cylc.flow.pathutil import get_workflow_run_dir
 
@@ -23,14 +23,12 @@ from pytest import param
 from types import SimpleNamespace
 
 from cylc.flow.hostuserutil import get_host
-from cylc.rose.entry_points import (
-    process_config,
-    load_rose_config,
-)
 from cylc.rose.utilities import (
     get_cli_opts_node,
+    load_rose_config,
     merge_opts,
     merge_rose_cylc_suite_install_conf,
+    process_config,
     rose_config_exists,
     rose_config_tree_loader,
 )
@@ -27,6 +27,7 @@ from uuid import uuid4
 from cylc.rose.platform_utils import (
     get_compat_mode,
     get_platform_from_task_def,
+    get_platforms_from_task_defs,
     get_platforms_from_task_jobs,
 )
 
@@ -213,6 +214,20 @@ def test_get_platform_from_task_def_subshell(
     assert platform['name'] == expected
 
 
+def test_get_platforms_from_task_defs(mock_glbl_cfg, fake_flow):
+    """It gets the platforms of several tasks at once."""
+    mock_glbl_cfg(*MOCK_GLBL_CFG)
+    platforms = get_platforms_from_task_defs(
+        fake_flow[0], ['foo', 'baz', 'kanga', 'roo']
+    )
+    assert {task: value['name'] for task, value in platforms.items()} == {
+        'foo': 'dairy',
+        'baz': 'localhost',
+        'kanga': 'my-platform',
+        'roo': 'my-host',
+    }
+
+
 @pytest.mark.parametrize(
     'create, expect',
     (